@@ -1,24 +1,47 @@
-import traci
+import traci.constants as tc
 import math
-from typing import Tuple, List
+from typing import Tuple, List, Optional, Dict, Any
+from sumo_backend import traci
 
 class EmergencyVehicleDetector:
     def __init__(self, target_cluster: str):
         self.target_cluster = target_cluster
+        self.cluster_pos: Optional[Tuple[float, float]] = None
+        self.emergency_vehicles: Dict[str, None] = {}
+        self.subscription_results: Dict[str, Dict[int, Any]] = {}
+
+    def capture_cluster_position(self):
+        """Store target cluster position (junctions are static during a run)"""
+        self.cluster_pos = traci.junction.getPosition(self.target_cluster)
 
     def detect_emergency_vehicles(self) -> List[str]:
         """Returns list of emergency vehicle IDs in simulation"""
-        return [vid for vid in traci.vehicle.getIDList() if vid.startswith('emergency')]
+        for vehicle_id in traci.simulation.getDepartedIDList():
+            if vehicle_id.startswith('emergency'):
+                traci.vehicle.subscribe(vehicle_id, [tc.VAR_POSITION])
+                self.emergency_vehicles[vehicle_id] = None
+        if self.emergency_vehicles:
+            for vehicle_id in traci.simulation.getArrivedIDList():
+                self.emergency_vehicles.pop(vehicle_id, None)
+        self.subscription_results = traci.vehicle.getAllSubscriptionResults()
+        # Teleporting vehicles are off the road and report an invalid position
+        return [
+            vid for vid in self.emergency_vehicles
+            if vid in self.subscription_results
+            and self.subscription_results[vid][tc.VAR_POSITION][0] != tc.INVALID_DOUBLE_VALUE
+        ]
     
     def calculate_distance(self, vehicle_id: str) -> float:
         """Calculate distance between vehicle and target cluster"""
-        vehicle_pos = traci.vehicle.getPosition(vehicle_id)
-        cluster_pos = traci.junction.getPosition(self.target_cluster)
-        
-        return math.sqrt(
-            (vehicle_pos[0] - cluster_pos[0])**2 + 
-            (vehicle_pos[1] - cluster_pos[1])**2
-        )
+        vehicle_pos = self.subscription_results[vehicle_id][tc.VAR_POSITION]
+        return math.dist(vehicle_pos, self.cluster_pos)
+
+    def calculate_squared_distance(self, vehicle_id: str) -> float:
+        """Squared distance to target cluster, for threshold checks without sqrt"""
+        vehicle_pos = self.subscription_results[vehicle_id][tc.VAR_POSITION]
+        dx = vehicle_pos[0] - self.cluster_pos[0]
+        dy = vehicle_pos[1] - self.cluster_pos[1]
+        return dx * dx + dy * dy
 
     def set_emergency_vehicle_properties(self, vehicle_id: str):
         """Set special properties for emergency vehicles"""
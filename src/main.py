@@ -1,11 +1,29 @@
-import traci
 import time
 import os
 from typing import List
 from emergency_vehicle.vehicle_detector import EmergencyVehicleDetector
 from traffic_light.light_manager import TrafficLightManager
+from traci import StepListener
+from sumo_backend import traci, using_libsumo
 from utils import Logger, Config
 
+class EmergencyStepListener(StepListener):
+    """Runs emergency handling after every simulation step"""
+    def __init__(self, controller: 'EmergencyTrafficControl'):
+        self.controller = controller
+        # SUMO keeps time in integer milliseconds; track it the same way
+        self.time_ms = round(traci.simulation.getTime() * 1000)
+        self.delta_ms = round(traci.simulation.getDeltaT() * 1000)
+
+    def step(self, t=0):
+        current_time = self.time_ms / 1000
+        if t > 0:
+            self.time_ms = round(t * 1000)
+        else:
+            self.time_ms += self.delta_ms
+        self.controller.process_step(current_time)
+        return True
+
 class EmergencyTrafficControl:
     def __init__(self):
         self.config = Config()
@@ -17,9 +35,13 @@ class EmergencyTrafficControl:
         self.last_emergency_time = 0
         self.distance_threshold = self.config.config['traffic_light']['emergency_distance_threshold']
         self.restoration_delay = self.config.config['traffic_light']['restoration_delay']
+        self.distance_threshold_sq = self.distance_threshold ** 2
 
     def run(self):
-        sumo_cmd = ["sumo-gui" if self.config.config['sumo']['gui_enabled'] else "sumo",
+        gui_enabled = self.config.config['sumo']['gui_enabled'] and not using_libsumo
+        if self.config.config['sumo']['gui_enabled'] and using_libsumo:
+            print("LIBSUMO_AS_TRACI is set: running headless, sumo-gui needs the TraCI socket")
+        sumo_cmd = ["sumo-gui" if gui_enabled else "sumo",
                     "-c", self.config.sumo_config_path]
         
         print(f"Starting SUMO with config: {self.config.sumo_config_path}")
@@ -27,31 +49,38 @@ class EmergencyTrafficControl:
         
         try:
             self.light_manager.capture_original_state()
+            self.detector.capture_cluster_position()
+            
+            traci.addStepListener(EmergencyStepListener(self))
             
             while traci.simulation.getMinExpectedNumber() > 0:
-                current_time = traci.simulation.getTime()
                 traci.simulationStep()
-                
-                emergency_vehicles = self.detector.detect_emergency_vehicles()
-                
-                if emergency_vehicles:
-                    self.handle_emergency_vehicles(emergency_vehicles, current_time)
-                else:
-                    self.check_restore_normal_traffic(current_time)
         
         except Exception as e:
             print(f"Simulation error: {e}")
         finally:
-            traci.close()
+            try:
+                self.logger.close()
+            finally:
+                traci.close()
+
+    def process_step(self, current_time: float):
+        emergency_vehicles = self.detector.detect_emergency_vehicles()
+        
+        if emergency_vehicles:
+            self.handle_emergency_vehicles(emergency_vehicles, current_time)
+        else:
+            self.check_restore_normal_traffic(current_time)
 
     def handle_emergency_vehicles(self, emergency_vehicles: List[str], current_time: float):
         self.emergency_detected = True
         self.last_emergency_time = current_time
         
         for vehicle_id in emergency_vehicles:
-            distance = self.detector.calculate_distance(vehicle_id)
+            squared_distance = self.detector.calculate_squared_distance(vehicle_id)
             
-            if distance < self.distance_threshold:
+            if squared_distance < self.distance_threshold_sq:
+                distance = self.detector.calculate_distance(vehicle_id)
                 self.detector.set_emergency_vehicle_properties(vehicle_id)
                 self.light_manager.set_emergency_state()
                 
@@ -0,0 +1,22 @@
+# src/sumo_backend.py
+import os
+from utils import Config
+
+def _import_traci():
+    """Use in-process libsumo when available; sumo-gui needs the TraCI socket.
+
+    As in SUMO's own tools, setting LIBSUMO_AS_TRACI (to any value) forces libsumo.
+    """
+    forced = 'LIBSUMO_AS_TRACI' in os.environ
+    if forced or not Config().config['sumo']['gui_enabled']:
+        try:
+            import libsumo
+            return libsumo
+        except ImportError:
+            if forced:
+                raise
+    import traci as socket_traci
+    return socket_traci
+
+traci = _import_traci()
+using_libsumo = traci.__name__ == 'libsumo'
@@ -1,42 +1,47 @@
-import traci
 from dataclasses import dataclass
 from typing import Optional
+from sumo_backend import traci
+
+_GREENIFY = str.maketrans('ruy', 'GGG')
 
 @dataclass
 class TrafficLightState:
-    logic: any
+    __slots__ = ('program',)
+
     program: str
-    complete_logic: any
 
 class TrafficLightManager:
     def __init__(self, cluster_id: str):
         self.cluster_id = cluster_id
         self.original_state: Optional[TrafficLightState] = None
+        self.emergency_active = False
+        self.emergency_state: Optional[str] = None
 
     def capture_original_state(self):
         """Store original traffic light state"""
         logic = traci.trafficlight.getCompleteRedYellowGreenDefinition(self.cluster_id)[0]
         self.original_state = TrafficLightState(
-            logic=logic,
-            program=traci.trafficlight.getProgram(self.cluster_id),
-            complete_logic=logic
+            program=traci.trafficlight.getProgram(self.cluster_id)
+        )
+        # A link is green if any greenified phase gives it G
+        states = [phase.state.translate(_GREENIFY) for phase in logic.phases]
+        self.emergency_state = ''.join(
+            'G' if 'G' in link else link[0] for link in zip(*states)
         )
 
     def set_emergency_state(self):
         """Set all lights to green for emergency vehicle"""
-        logic = traci.trafficlight.getCompleteRedYellowGreenDefinition(self.cluster_id)[0]
-        for phase in logic.phases:
-            phase.state = ''.join(['G' if char in 'ruyG' else char for char in phase.state])
-        traci.trafficlight.setCompleteRedYellowGreenDefinition(self.cluster_id, logic)
+        if self.emergency_active:
+            return
+        # Held until restore_normal_state switches back to the original program
+        traci.trafficlight.setRedYellowGreenState(self.cluster_id, self.emergency_state)
+        self.emergency_active = True
 
     def restore_normal_state(self):
         """Restore original traffic light state"""
         if self.original_state:
-            traci.trafficlight.setCompleteRedYellowGreenDefinition(
-                self.cluster_id, 
-                self.original_state.complete_logic
-            )
             traci.trafficlight.setProgram(
                 self.cluster_id, 
                 self.original_state.program
-            )
\ No newline at end of file
+            )
+        self.emergency_active = False
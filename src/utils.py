@@ -1,5 +1,7 @@
 # src/utils.py
+import atexit
 import csv
+import functools
 import time
 import os
 import json
@@ -16,8 +18,8 @@ class Config:
     
     def _load_config(self):
         src_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(src_dir)
-        config_path = os.path.join(project_root, 'config', 'config.json')
+        self.project_root = os.path.dirname(src_dir)
+        config_path = os.path.join(self.project_root, 'config', 'config.json')
         
         try:
             with open(config_path, 'r') as f:
@@ -25,21 +27,21 @@ class Config:
         except FileNotFoundError:
             print(f"Config file not found at: {config_path}")
             print(f"Current working directory: {os.getcwd()}")
-            print(f"Project root directory: {project_root}")
+            print(f"Project root directory: {self.project_root}")
             raise
     
-    @property
+    @functools.cached_property
     def sumo_config_path(self):
-        src_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(src_dir)
-        return os.path.join(project_root, self.config['sumo']['config_path'])
+        return os.path.join(self.project_root, self.config['sumo']['config_path'])
 
 class Logger:
+    BUFFER_SIZE = 512
+
     def __init__(self, filename_prefix: str):
         self.config = Config()
-        src_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(src_dir)
-        log_dir = os.path.join(project_root, self.config.config['logging']['directory'])
+        self._buffer: List[tuple] = []
+        self.buffer_size = self.config.config['logging'].get('buffer_size', self.BUFFER_SIZE)
+        log_dir = os.path.join(self.config.project_root, self.config.config['logging']['directory'])
         
         os.makedirs(log_dir, exist_ok=True)
         
@@ -48,23 +50,42 @@ class Logger:
         self.setup_csv()
 
     def setup_csv(self):
-        with open(self.filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([
-                'Timestamp', 
-                'Emergency Vehicle ID', 
-                'Traffic Light Cluster', 
-                'Distance', 
-                'Action Taken'
-            ])
+        # Kept open for the whole run; closed by close() or at interpreter exit
+        self._file = open(self.filename, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([
+            'Timestamp', 
+            'Emergency Vehicle ID', 
+            'Traffic Light Cluster', 
+            'Distance', 
+            'Action Taken'
+        ])
+        atexit.register(self.close)
 
     def log_event(self, data: Dict[str, Any]):
-        with open(self.filename, 'a', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([
-                data.get('timestamp'),
-                data.get('vehicle_id', 'N/A'),
-                data.get('cluster'),
-                data.get('distance', 'N/A'),
-                data.get('action')
-            ])
\ No newline at end of file
+        if self._file.closed:
+            raise ValueError(f"Logger for {self.filename} is already closed")
+        self._buffer.append((
+            data.get('timestamp'),
+            data.get('vehicle_id', 'N/A'),
+            data.get('cluster'),
+            data.get('distance', 'N/A'),
+            data.get('action')
+        ))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered events to the CSV file"""
+        if not self._buffer:
+            return
+        self._writer.writerows(self._buffer)
+        self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        """Write remaining events and close the CSV file"""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
\ No newline at end of file